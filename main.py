@@ -7,22 +7,198 @@
 
 import sys
 import json
+import gzip
+import time
+import itertools
+import functools
+from contextlib import contextmanager
+from operator import attrgetter
 import numpy as np
 from typing import List, Dict, Optional, Tuple
-from scipy.optimize import linprog, minimize
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox, QFileDialog, QTabWidget, QTextEdit, QSpinBox,
+    QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QTableView,
+    QMessageBox, QFileDialog, QTabWidget, QTextEdit, QPlainTextEdit, QSpinBox,
     QDoubleSpinBox, QHeaderView, QDialog, QDialogButtonBox, QGroupBox,
-    QFormLayout
+    QFormLayout, QStyledItemDelegate, QStyleOptionButton, QStyle, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import (
+    Qt, QSettings, QEvent, QTimer, QByteArray, QObject, QRunnable, QThreadPool,
+    QAbstractTableModel, QModelIndex, QSignalBlocker, pyqtSignal
+)
+from PyQt6.QtGui import QFont, QColor, QTextDocument
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+def _json_loads(data):
+    """解析JSON文本（str 或 bytes）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data) -> bytes:
+    """序列化为UTF-8编码的JSON，保留中文字符"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _json_dumps_pretty(data) -> bytes:
+    """序列化为缩进2格的UTF-8编码JSON，用于导出文件"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+# 课程ID = 启动时间戳 + 进程内递增序号，跨会话也不会重复
+_ID_PREFIX = str(int(time.time() * 1000))
+_ID_COUNTER = itertools.count()
+
+
+def _generate_course_id() -> str:
+    return f"{_ID_PREFIX}_{next(_ID_COUNTER)}"
+
+
+_njit = None  # numba.njit，首次需要时才导入；False 表示未安装
+_JIT_MIN_SIZE = 256  # 课程数少于此值时直接用 numpy，不为导入 numba 付出启动开销
+
+
+def _load_njit():
+    """按需导入 numba，未安装时返回 None"""
+    global _njit
+    if _njit is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba 为可选依赖，未安装时使用 numpy 实现
+            njit = False
+        _njit = njit
+    return _njit or None
+
+
+def _lazy_njit(py_func, fallback, **options):
+    """首次调用时才用 numba 编译 py_func；numba 未安装时改用 fallback"""
+    kernel = None
+    
+    @functools.wraps(py_func)
+    def call(*args):
+        nonlocal kernel
+        if kernel is None:
+            njit = _load_njit()
+            kernel = njit(cache=True, **options)(py_func) if njit else fallback
+        return kernel(*args)
+    return call
+
+
+def _wavg(credits: np.ndarray, scores: np.ndarray) -> Tuple[float, float]:
+    """
+    加权平均分，学分不为正的课程不计入
+    
+    始终使用 numpy：一次点积的开销远小于 numba 的导入和编译，
+    且会在主线程刷新表格时调用，不能为此卡住界面
+    """
+    valid = credits > 0
+    total_credit = float(np.sum(credits[valid]))
+    total_score = float(np.dot(credits[valid], scores[valid]))
+    avg = total_score / total_credit if total_credit > 0 else 0.0
+    return total_credit, avg
+
+
+def _allocate_numpy(credits: np.ndarray, min_scores: np.ndarray,
+                    max_scores: np.ndarray, difficulties: np.ndarray,
+                    extra_sum: float) -> np.ndarray:
+    """
+    线性规划的解析解（numpy 实现）
+    
+    目标函数是线性的，且只有一个等式约束加上下界约束，
+    因此最优解中除一门"枢轴"课程外，其余课程都取在 min_score 或 max_score 上。
+    按"每单位加权分的难度成本"(difficulty / credit) 从低到高依次把课程提到最高分，
+    直到在最低分基础上多出的加权总分达到 extra_sum，枢轴课程取恰好补足的分数。
+    """
+    n = len(credits)
+    # 学分为0的课程对加权分没有贡献，排在最后
+    ratios = np.full(n, np.inf)
+    np.divide(difficulties, credits, out=ratios, where=credits > 0)
+    order = np.argsort(ratios, kind='stable')
+    
+    gains = max_scores - min_scores
+    gains *= credits
+    gains = np.cumsum(gains[order])
+    pivot = int(np.searchsorted(gains, extra_sum))
+    
+    # 按浮点数复制，整数分数的输入也不会截断枢轴课程的小数分数
+    scores = min_scores.astype(np.float64)
+    # extra_sum 因舍入略大于总增益时 pivot == n，学分为0的课程仍保持最低分
+    raised = order[:min(pivot, int(np.count_nonzero(credits > 0)))]
+    scores[raised] = max_scores[raised]
+    if pivot < n and credits[order[pivot]] > 0:
+        idx = order[pivot]
+        remaining = extra_sum - (gains[pivot - 1] if pivot > 0 else 0.0)
+        scores[idx] = min(min_scores[idx] + remaining / credits[idx], max_scores[idx])
+    return scores
+
+
+def _allocate_loop(credits, min_scores, max_scores, difficulties, extra_sum):
+    """线性规划的解析解（供 numba 编译的循环版本），算法同 _allocate_numpy"""
+    n = credits.shape[0]
+    ratios = np.empty(n)
+    for i in range(n):
+        ratios[i] = difficulties[i] / credits[i] if credits[i] > 0 else np.inf
+    order = np.argsort(ratios, kind='mergesort')
+    
+    scores = min_scores.astype(np.float64)
+    remaining = extra_sum
+    for k in range(n):
+        i = order[k]
+        if credits[i] <= 0:
+            break
+        gain = credits[i] * (max_scores[i] - min_scores[i])
+        if gain < remaining:
+            scores[i] = max_scores[i]
+            remaining -= gain
+        else:
+            scores[i] = min(min_scores[i] + remaining / credits[i], max_scores[i])
+            break
+    return scores
+
+
+# 排序键中用 inf 标记学分为0的课程，因此不启用 nnan/ninf 假设
+_allocate_jit = _lazy_njit(_allocate_loop, _allocate_numpy,
+                           fastmath={'nsz', 'arcp', 'contract', 'reassoc'}, error_model='numpy')
+
+
+def _allocate(credits: np.ndarray, min_scores: np.ndarray, max_scores: np.ndarray,
+              difficulties: np.ndarray, extra_sum: float) -> np.ndarray:
+    """线性规划的解析解，课程较多时使用 numba 编译的版本"""
+    if credits.shape[0] < _JIT_MIN_SIZE:
+        return _allocate_numpy(credits, min_scores, max_scores, difficulties, extra_sum)
+    return _allocate_jit(credits, min_scores, max_scores, difficulties, extra_sum)
+
+
+@contextmanager
+def _batch_table_update(table):
+    """批量填充表格：期间暂停重绘、信号和排序，结束后统一刷新一次"""
+    sorting = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    blocked = table.blockSignals(True)
+    table.setSortingEnabled(False)
+    try:
+        yield table
+    finally:
+        table.setSortingEnabled(sorting)
+        table.blockSignals(blocked)
+        table.setUpdatesEnabled(True)
+        table.viewport().update()
 
 
 class PlannedCourse:
     """计划课程数据模型（优化版）"""
+    __slots__ = ('id', 'name', 'credit', 'min_score', 'max_score', 'difficulty', 'optimized_target')
+    
     def __init__(self, name: str, credit: float, 
                  min_score: float, max_score: float, difficulty: float,
                  course_id: Optional[str] = None):
@@ -36,9 +212,7 @@ class PlannedCourse:
     
     @staticmethod
     def _generate_id():
-        import time
-        import random
-        return f"{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
+        return _generate_course_id()
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -69,6 +243,8 @@ class PlannedCourse:
 
 class CompletedCourse:
     """已修课程数据模型"""
+    __slots__ = ('id', 'name', 'credit', 'score')
+    
     def __init__(self, name: str, credit: float, score: float,
                  course_id: Optional[str] = None):
         self.id = course_id or self._generate_id()
@@ -78,9 +254,7 @@ class CompletedCourse:
     
     @staticmethod
     def _generate_id():
-        import time
-        import random
-        return f"{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
+        return _generate_course_id()
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -102,33 +276,66 @@ class CompletedCourse:
         )
 
 
+def courses_to_dicts(courses: List) -> List[Dict]:
+    """批量转换为字典列表，__slots__ 中的字段名即为JSON键名"""
+    if not courses:
+        return []
+    fields = type(courses[0]).__slots__
+    getter = attrgetter(*fields)
+    return [dict(zip(fields, getter(c))) for c in courses]
+
+
 class OptimizationEngine:
     """优化引擎 - 使用运筹学方法计算最优分数分配"""
     
+    DIFFICULTY_BINS = (0.3, 0.7)  # 简单 / 中等 / 困难 的分界
+    _SUGGESTION_HEADERS = (
+        '\n📗 简单课程（建议重点提分）：',
+        '\n📘 中等难度课程：',
+        '\n📕 困难课程（保证及格即可）：'
+    )
+    
+    @staticmethod
+    def credit_score_arrays(courses: List, score_attr: str = 'score') -> Tuple[np.ndarray, np.ndarray]:
+        """提取学分和分数数组，分数为空的课程学分记为0"""
+        scores = [getattr(c, score_attr, 0) for c in courses]
+        credits = np.array([c.credit if s is not None else 0.0 for c, s in zip(courses, scores)],
+                           dtype=np.float64)
+        scores = np.array([s if s is not None else 0.0 for s in scores], dtype=np.float64)
+        return credits, scores
+    
     @staticmethod
     def calculate_weighted_avg(courses: List, score_attr: str = 'score') -> Tuple[float, float]:
         """计算加权平均分"""
-        total_credit = 0.0
-        total_score = 0.0
-        
-        for course in courses:
-            credit = course.credit
-            score = getattr(course, score_attr, 0)
-            if credit <= 0 or score is None:
-                continue
-            total_credit += credit
-            total_score += credit * score
-        
-        avg = total_score / total_credit if total_credit > 0 else 0.0
-        return total_credit, avg
+        credits, scores = OptimizationEngine.credit_score_arrays(courses, score_attr)
+        return _wavg(credits, scores)
+    
+    @staticmethod
+    def planned_arrays(planned_courses: List[PlannedCourse]) -> Dict[str, np.ndarray]:
+        """将计划课程列表转换为按字段连续存储的数组"""
+        # 一次遍历取出四个数值字段，再转置为各自连续的行
+        columns = np.fromiter(
+            ((c.credit, c.min_score, c.max_score, c.difficulty) for c in planned_courses),
+            dtype=np.dtype((np.float64, 4)), count=len(planned_courses)
+        )
+        credits, min_scores, max_scores, difficulties = np.ascontiguousarray(columns.T)
+        return {
+            'credits': credits,
+            'min_scores': min_scores,
+            'max_scores': max_scores,
+            'difficulties': difficulties
+        }
     
     @staticmethod
     def optimize_scores(completed_courses: List[CompletedCourse],
                        planned_courses: List[PlannedCourse],
-                       target_gpa: float) -> Dict:
+                       target_gpa: float,
+                       arrays: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """
         使用优化算法计算各科最优目标分数
         
+        arrays 为 planned_arrays() 的结果，传入缓存可避免每次重新构建数组
+        
         目标函数：最小化总体难度加权的努力成本
         约束条件：
         1. 每科分数在 [min_score, max_score] 范围内
@@ -157,16 +364,15 @@ class OptimizationEngine:
         completed_weighted_sum = completed_avg * completed_credit
         
         # 计划课程数据
-        n = len(planned_courses)
-        credits = np.array([c.credit for c in planned_courses])
-        min_scores = np.array([c.min_score for c in planned_courses])
-        max_scores = np.array([c.max_score for c in planned_courses])
-        difficulties = np.array([c.difficulty for c in planned_courses])
+        if arrays is None:
+            arrays = OptimizationEngine.planned_arrays(planned_courses)
+        credits = arrays['credits']
+        max_scores = arrays['max_scores']
         
-        total_credit = completed_credit + np.sum(credits)
+        total_credit = completed_credit + credits.sum()
         
         # 检查是否可行（即使全部拿最高分也无法达到目标）
-        max_possible_weighted_sum = completed_weighted_sum + np.sum(credits * max_scores)
+        max_possible_weighted_sum = completed_weighted_sum + credits @ max_scores
         max_possible_gpa = max_possible_weighted_sum / total_credit
         
         if max_possible_gpa < target_gpa:
@@ -182,12 +388,14 @@ class OptimizationEngine:
                     '建议：'
                 ],
                 'adjustments': OptimizationEngine._generate_adjustments(
-                    completed_courses, planned_courses, target_gpa, gap
+                    target_gpa, gap, total_credit
                 )
             }
         
         # 检查最低分是否已经超过目标
-        min_possible_weighted_sum = completed_weighted_sum + np.sum(credits * min_scores)
+        min_scores = arrays['min_scores']
+        credits_min = credits @ min_scores
+        min_possible_weighted_sum = completed_weighted_sum + credits_min
         min_possible_gpa = min_possible_weighted_sum / total_credit
         
         if min_possible_gpa >= target_gpa:
@@ -206,63 +414,26 @@ class OptimizationEngine:
         # 可行，进行优化
         # 目标函数：最小化 sum(difficulty * (score - min_score))
         # 即优先在简单的课程上拿高分，难的课程可以适当降低要求
+        difficulties = arrays['difficulties']
+        required_sum = target_gpa * total_credit - completed_weighted_sum
+        optimized_scores = _allocate(
+            credits, min_scores, max_scores, difficulties,
+            required_sum - credits_min
+        )
+        final_gpa = (completed_weighted_sum + credits @ optimized_scores) / total_credit
         
-        def objective(x):
-            """目标函数：最小化难度加权的努力"""
-            effort = difficulties * (x - min_scores)
-            return np.sum(effort)
-        
-        def constraint_gpa(x):
-            """约束：达到目标GPA"""
-            planned_weighted_sum = np.sum(credits * x)
-            total_weighted_sum = completed_weighted_sum + planned_weighted_sum
-            gpa = total_weighted_sum / total_credit
-            return gpa - target_gpa
-        
-        # 边界约束
-        bounds = [(min_s, max_s) for min_s, max_s in zip(min_scores, max_scores)]
-        
-        # 等式约束
-        constraints = [
-            {'type': 'eq', 'fun': constraint_gpa}
-        ]
-        
-        # 初始猜测：线性插值
-        required_planned_avg = (target_gpa * total_credit - completed_weighted_sum) / np.sum(credits)
-        x0 = np.full(n, required_planned_avg)
-        x0 = np.clip(x0, min_scores, max_scores)
-        
-        # 优化
-        result = minimize(objective, x0, method='SLSQP', bounds=bounds, constraints=constraints)
-        
-        if result.success:
-            optimized_scores = result.x
-            final_gpa = (completed_weighted_sum + np.sum(credits * optimized_scores)) / total_credit
-            
-            # 生成建议
-            suggestions = OptimizationEngine._generate_suggestions(
-                planned_courses, optimized_scores, difficulties
-            )
-            
-            return {
-                'feasible': True,
-                'optimized_scores': optimized_scores.tolist(),
-                'total_gpa': final_gpa,
-                'suggestions': suggestions,
-                'adjustments': {}
-            }
-        else:
-            # 优化失败，使用均匀分配
-            uniform_scores = np.full(n, required_planned_avg)
-            uniform_scores = np.clip(uniform_scores, min_scores, max_scores)
-            
-            return {
-                'feasible': True,
-                'optimized_scores': uniform_scores.tolist(),
-                'total_gpa': target_gpa,
-                'suggestions': ['使用均匀分配策略'],
-                'adjustments': {}
-            }
+        # 生成建议
+        suggestions = OptimizationEngine._generate_suggestions(
+            planned_courses, optimized_scores, difficulties
+        )
+        
+        return {
+            'feasible': True,
+            'optimized_scores': optimized_scores.tolist(),
+            'total_gpa': final_gpa,
+            'suggestions': suggestions,
+            'adjustments': {}
+        }
     
     @staticmethod
     def _generate_suggestions(planned_courses: List[PlannedCourse],
@@ -271,50 +442,30 @@ class OptimizationEngine:
         """生成优化建议"""
         suggestions = ['优化结果分析：\n']
         
-        # 按难度分类
-        easy_courses = []
-        medium_courses = []
-        hard_courses = []
+        # 按难度分类：<0.3 简单，0.3-0.7 中等，>=0.7 困难
+        buckets = np.digitize(difficulties, OptimizationEngine.DIFFICULTY_BINS)
+        names = [c.name for c in planned_courses]
         
-        for i, course in enumerate(planned_courses):
-            score = optimized_scores[i]
-            diff = difficulties[i]
-            
-            if diff < 0.3:
-                easy_courses.append((course.name, score))
-            elif diff < 0.7:
-                medium_courses.append((course.name, score))
-            else:
-                hard_courses.append((course.name, score))
-        
-        if easy_courses:
-            suggestions.append('\n📗 简单课程（建议重点提分）：')
-            for name, score in easy_courses:
-                suggestions.append(f'  • {name}: 目标 {score:.1f} 分')
-        
-        if medium_courses:
-            suggestions.append('\n📘 中等难度课程：')
-            for name, score in medium_courses:
-                suggestions.append(f'  • {name}: 目标 {score:.1f} 分')
-        
-        if hard_courses:
-            suggestions.append('\n📕 困难课程（保证及格即可）：')
-            for name, score in hard_courses:
-                suggestions.append(f'  • {name}: 目标 {score:.1f} 分')
-        
-        suggestions.append('\n💡 策略建议：')
-        suggestions.append('  • 优先在简单课程上投入精力，争取高分')
-        suggestions.append('  • 困难课程保证达到目标分数即可')
-        suggestions.append('  • 合理分配学习时间，避免过度追求完美')
+        for bucket, header in enumerate(OptimizationEngine._SUGGESTION_HEADERS):
+            indices = np.flatnonzero(buckets == bucket)
+            if indices.size:
+                suggestions.append(header)
+                suggestions.extend(f'  • {names[i]}: 目标 {optimized_scores[i]:.1f} 分' for i in indices)
+        
+        suggestions.extend((
+            '\n💡 策略建议：',
+            '  • 优先在简单课程上投入精力，争取高分',
+            '  • 困难课程保证达到目标分数即可',
+            '  • 合理分配学习时间，避免过度追求完美'
+        ))
         
         return suggestions
     
     @staticmethod
-    def _generate_adjustments(completed_courses: List[CompletedCourse],
-                             planned_courses: List[PlannedCourse],
-                             target_gpa: float,
-                             gap: float) -> Dict:
-        """生成调整建议"""
+    def _generate_adjustments(target_gpa: float,
+                             gap: float,
+                             total_credit: float) -> Dict:
+        """生成调整建议（total_credit 为已修与计划课程的总学分）"""
         adjustments = {
             'options': []
         }
@@ -328,8 +479,7 @@ class OptimizationEngine:
         })
         
         # 选项2：增加高分课程
-        total_planned_credit = sum(c.credit for c in planned_courses)
-        additional_credit_needed = gap * (sum(c.credit for c in completed_courses) + total_planned_credit) / 10
+        additional_credit_needed = gap * total_credit / 10
         adjustments['options'].append({
             'type': 'add_courses',
             'description': f'增加约 {additional_credit_needed:.1f} 学分的高分课程（预期90分以上）',
@@ -348,21 +498,88 @@ class OptimizationEngine:
 
 class DataManager:
     """数据管理器"""
+    SAVE_DELAY_MS = 500
+    
     def __init__(self):
         self.completed_courses: List[CompletedCourse] = []
         self.planned_courses: List[PlannedCourse] = []
         self.target_score: Optional[float] = None
+        self.planned_version = 0  # 计划课程每次变更时递增
+        self.completed_version = 0  # 已修课程每次变更时递增
+        self._soa_cache: Dict = {}
+        self._completed_cache: Dict = {}
         self.settings = QSettings('WeightedPlanner', 'GradeAppV2')
         self.load_from_settings()
+        
+        # 连续修改时合并保存：最后一次修改后 500ms 才写入
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_to_settings)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_save)
+    
+    def get_planned_arrays(self) -> Dict[str, np.ndarray]:
+        """获取计划课程的数组视图，课程未变更时复用缓存"""
+        if self._soa_cache.get('version') != self.planned_version:
+            self._soa_cache = OptimizationEngine.planned_arrays(self.planned_courses)
+            self._soa_cache['version'] = self.planned_version
+        return self._soa_cache
+    
+    def get_completed_arrays(self) -> Dict[str, np.ndarray]:
+        """获取已修课程的学分/分数数组，课程未变更时复用缓存"""
+        if self._completed_cache.get('version') != self.completed_version:
+            credits, scores = OptimizationEngine.credit_score_arrays(self.completed_courses)
+            self._completed_cache = {
+                'version': self.completed_version,
+                'credits': credits,
+                'scores': scores
+            }
+        return self._completed_cache
+    
+    def completed_weighted_avg(self) -> Tuple[float, float]:
+        """已修课程的总学分和加权平均分"""
+        arrays = self.get_completed_arrays()
+        return _wavg(arrays['credits'], arrays['scores'])
+    
+    def add_completed_course(self, course: CompletedCourse):
+        """添加已修课程"""
+        self.completed_courses.append(course)
+        self.completed_version += 1
+        self.schedule_save()
+    
+    def delete_completed_course(self, course_id: str):
+        """删除已修课程"""
+        self.completed_courses = [c for c in self.completed_courses if c.id != course_id]
+        self.completed_version += 1
+        self.schedule_save()
+    
+    def add_planned_course(self, course: PlannedCourse):
+        """添加计划课程"""
+        self.planned_courses.append(course)
+        self.planned_version += 1
+        self.schedule_save()
+    
+    def delete_planned_course(self, course_id: str):
+        """删除计划课程"""
+        self.planned_courses = [c for c in self.planned_courses if c.id != course_id]
+        self.planned_version += 1
+        self.schedule_save()
     
     def load_from_settings(self):
         """从设置加载数据"""
         try:
             data_str = self.settings.value('app_data', '')
+            if isinstance(data_str, QByteArray):
+                # 新格式：gzip 压缩的 UTF-8 JSON；旧版本保存的是 JSON 字符串
+                data_str = gzip.decompress(bytes(data_str))
             if data_str:
-                data = json.loads(data_str)
+                data = _json_loads(data_str)
                 self.completed_courses = [CompletedCourse.from_dict(c) for c in data.get('completed', [])]
                 self.planned_courses = [PlannedCourse.from_dict(c) for c in data.get('planned', [])]
+                self.completed_version += 1
+                self.planned_version += 1
                 self.target_score = data.get('targetScore')
         except Exception as e:
             print(f"加载数据失败: {e}")
@@ -371,22 +588,34 @@ class DataManager:
         """保存数据到设置"""
         try:
             data = {
-                'completed': [c.to_dict() for c in self.completed_courses],
-                'planned': [c.to_dict() for c in self.planned_courses],
+                'completed': courses_to_dicts(self.completed_courses),
+                'planned': courses_to_dicts(self.planned_courses),
                 'targetScore': self.target_score
             }
-            self.settings.setValue('app_data', json.dumps(data, ensure_ascii=False))
+            payload = gzip.compress(_json_dumps(data), compresslevel=1)
+            self.settings.setValue('app_data', QByteArray(payload))
         except Exception as e:
             print(f"保存数据失败: {e}")
     
+    def schedule_save(self):
+        """延迟保存，计时期间的再次修改会重新计时"""
+        self._save_timer.start()
+    
+    def flush_save(self):
+        """立即写入尚未保存的修改，并同步到磁盘"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_to_settings()
+            self.settings.sync()
+    
     def export_to_json(self, filepath: str, selected_courses: Optional[List[str]] = None):
         """导出为JSON文件"""
         if selected_courses:
-            completed = [c.to_dict() for c in self.completed_courses if c.id in selected_courses]
-            planned = [c.to_dict() for c in self.planned_courses if c.id in selected_courses]
+            completed = courses_to_dicts([c for c in self.completed_courses if c.id in selected_courses])
+            planned = courses_to_dicts([c for c in self.planned_courses if c.id in selected_courses])
         else:
-            completed = [c.to_dict() for c in self.completed_courses]
-            planned = [c.to_dict() for c in self.planned_courses]
+            completed = courses_to_dicts(self.completed_courses)
+            planned = courses_to_dicts(self.planned_courses)
         
         data = {
             'completed': completed,
@@ -395,14 +624,21 @@ class DataManager:
             'version': '2.0'
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps_pretty(data))
+    
+    @staticmethod
+    def read_json_file(filepath: str) -> Dict:
+        """读取并解析JSON文件（不修改数据，可在后台线程调用）"""
+        with open(filepath, 'rb') as f:
+            return _json_loads(f.read())
     
     def import_from_json(self, filepath: str, merge: bool = False):
         """从JSON文件导入"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        self.apply_imported(self.read_json_file(filepath), merge)
+    
+    def apply_imported(self, data: Dict, merge: bool = False):
+        """应用已解析的导入数据"""
         if not merge:
             self.completed_courses.clear()
             self.planned_courses.clear()
@@ -414,6 +650,8 @@ class DataManager:
         for p_data in data.get('planned', []):
             course = PlannedCourse.from_dict(p_data)
             self.planned_courses.append(course)
+        self.completed_version += 1
+        self.planned_version += 1
         
         if 'targetScore' in data and data['targetScore'] is not None:
             self.target_score = data['targetScore']
@@ -421,47 +659,119 @@ class DataManager:
         self.save_to_settings()
 
 
-class LLMGuideDialog(QDialog):
-    """LLM使用指南对话框"""
+class OptimizeTask(QRunnable):
+    """在线程池中运行优化，结果通过信号送回主线程"""
+    class Signals(QObject):
+        finished = pyqtSignal(dict)
+        failed = pyqtSignal(str)
+    
+    def __init__(self, completed_courses: List[CompletedCourse],
+                 planned_courses: List[PlannedCourse], target_gpa: float,
+                 arrays: Dict[str, np.ndarray]):
+        super().__init__()
+        self.signals = OptimizeTask.Signals()
+        # 主线程的增删只会替换或追加列表，课程对象本身在优化期间不会被修改，
+        # 因此复制列表即可；arrays 为 DataManager 缓存的数组，版本变化时整体替换而非原地修改
+        self.completed_courses = list(completed_courses)
+        self.planned_courses = list(planned_courses)
+        self.target_gpa = target_gpa
+        self.arrays = arrays
+    
+    def run(self):
+        try:
+            result = OptimizationEngine.optimize_scores(
+                self.completed_courses, self.planned_courses, self.target_gpa, self.arrays
+            )
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class OptimizationTableModel(QAbstractTableModel):
+    """优化结果表格模型：按列保存文本，只有可见单元格才会被取用"""
+    HEADERS = ('课程名', '学分', '分数范围', '难度', '优化目标', '说明')
+    TARGET_COLUMN = 4
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("LLM生成JSON数据指南")
-        self.setMinimumSize(700, 600)
-        self.init_ui()
+        self._columns: List[List[Optional[str]]] = [[] for _ in self.HEADERS]
+        self._colors: List[Optional[QColor]] = []
     
-    def init_ui(self):
-        layout = QVBoxLayout()
-        
-        title = QLabel("如何使用LLM生成符合规定的JSON数据（V2.0格式）")
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        title.setFont(title_font)
-        layout.addWidget(title)
-        
-        guide_text = QTextEdit()
-        guide_text.setReadOnly(True)
-        guide_text.setMarkdown(self.get_guide_content())
-        layout.addWidget(guide_text)
-        
-        example_label = QLabel("JSON格式示例（V2.0）：")
-        example_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
-        layout.addWidget(example_label)
-        
-        example_text = QTextEdit()
-        example_text.setReadOnly(True)
-        example_text.setPlainText(self.get_example_json())
-        example_text.setMaximumHeight(250)
-        layout.addWidget(example_text)
-        
-        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
-        button_box.rejected.connect(self.close)
-        layout.addWidget(button_box)
-        
-        self.setLayout(layout)
+    def set_rows(self, columns: List[List[Optional[str]]], colors: List[Optional[QColor]]):
+        """整体替换表格内容，只触发一次模型重置"""
+        self.beginResetModel()
+        self._columns = columns
+        self._colors = colors
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._colors)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[index.column()][index.row()]
+        if role == Qt.ItemDataRole.BackgroundRole and index.column() == self.TARGET_COLUMN:
+            return self._colors[index.row()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+class ImportTask(QRunnable):
+    """在线程池中读取并解析导入文件，结果通过信号送回主线程"""
+    class Signals(QObject):
+        finished = pyqtSignal(object)
+        failed = pyqtSignal(str)
+    
+    def __init__(self, filepath: str):
+        super().__init__()
+        self.signals = ImportTask.Signals()
+        self.filepath = filepath
+    
+    def run(self):
+        try:
+            data = DataManager.read_json_file(self.filepath)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(data)
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """在单元格内绘制"删除"按钮，点击时以该行存储的课程ID调用回调"""
+    def __init__(self, on_delete, parent=None):
+        super().__init__(parent)
+        self.on_delete = on_delete
+    
+    @staticmethod
+    def _button_rect(option):
+        return option.rect.adjusted(2, 2, -2, -2)
+    
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option)
+        button.text = "删除"
+        button.state = QStyle.StateFlag.State_Enabled
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
     
-    def get_guide_content(self) -> str:
-        return """
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._button_rect(option).contains(event.position().toPoint())):
+            self.on_delete(index.data(Qt.ItemDataRole.UserRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+LLM_GUIDE_MARKDOWN = """
 ## V2.0 新格式说明
 
 计划课程现在需要提供：
@@ -489,9 +799,8 @@ class LLMGuideDialog(QDialog):
 目标GPA：85
 ```
 """
-    
-    def get_example_json(self) -> str:
-        return """{
+
+LLM_EXAMPLE_JSON = """{
   "completed": [
     {
       "id": "c001",
@@ -523,13 +832,92 @@ class LLMGuideDialog(QDialog):
 }"""
 
 
+class LLMGuideDialog(QDialog):
+    """LLM使用指南对话框"""
+    _guide_html: Optional[str] = None
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("LLM生成JSON数据指南")
+        self.setMinimumSize(700, 600)
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        title = QLabel("如何使用LLM生成符合规定的JSON数据（V2.0格式）")
+        title_font = QFont()
+        title_font.setPointSize(14)
+        title_font.setBold(True)
+        title.setFont(title_font)
+        layout.addWidget(title)
+        
+        guide_text = QTextEdit()
+        guide_text.setReadOnly(True)
+        guide_text.setHtml(self.get_guide_html())
+        layout.addWidget(guide_text)
+        
+        example_label = QLabel("JSON格式示例（V2.0）：")
+        example_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
+        layout.addWidget(example_label)
+        
+        example_text = QTextEdit()
+        example_text.setReadOnly(True)
+        example_text.setPlainText(LLM_EXAMPLE_JSON)
+        example_text.setMaximumHeight(250)
+        layout.addWidget(example_text)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+        
+        self.setLayout(layout)
+    
+    @classmethod
+    def get_guide_html(cls) -> str:
+        """指南的HTML，首次打开时解析一次Markdown并缓存"""
+        if cls._guide_html is None:
+            doc = QTextDocument()
+            doc.setMarkdown(LLM_GUIDE_MARKDOWN)
+            cls._guide_html = doc.toHtml()
+        return cls._guide_html
+
+
 class MainWindow(QMainWindow):
     """主窗口"""
+    TARGET_HIGH_COLOR = QColor(255, 200, 200)  # 红色 - 需要高分
+    TARGET_LOW_COLOR = QColor(200, 255, 200)  # 绿色 - 要求低
+    TARGET_MID_COLOR = QColor(255, 255, 200)  # 黄色 - 中等
+    TARGET_COLORS = (TARGET_HIGH_COLOR, TARGET_LOW_COLOR, TARGET_MID_COLOR)
+    TARGET_NOTES = ("需要全力以赴", "保持正常水平即可", "需要认真准备")
+    DIFFICULTY_TEXTS = ("简单 📗", "中等 📘", "困难 📕")
+    SUMMARY_STATUS = {
+        True: ("green", "✅ 目标可达成"),
+        False: ("red", "❌ 目标无法达成")
+    }
+    SUMMARY_TEMPLATE = (
+        "<div style='font-size: 14px;'>"
+        "<p style='color: {color}; font-weight: bold; font-size: 16px;'>{status}</p>"
+        "<p><b>目标GPA:</b> {target:.2f}</p>"
+        "<p><b>预期GPA:</b> {gpa:.2f}</p>"
+        "</div>"
+    )
+    
     def __init__(self):
         super().__init__()
         self.data_manager = DataManager()
         self.setWindowTitle("加权平均分规划助手 - 智能优化版")
         self.setMinimumSize(1200, 750)
+        self._optimize_task: Optional[OptimizeTask] = None
+        self._optimizing_key: Optional[Tuple] = None  # 正在优化的 (计划版本, 已修版本, 目标分数)
+        # 上一次优化的输入标识和结果，数据和目标都未变化时直接复用
+        self._last_optimization: Tuple[Optional[Tuple], Optional[Dict]] = (None, None)
+        self._import_task: Optional[ImportTask] = None
+        self._import_progress: Optional[QProgressDialog] = None
+        self._import_merge = False
+        # 表格当前显示的数据版本，与 DataManager 的版本号不同时才需要重建
+        self._completed_shown_version = -1
+        self._planned_shown_version = -1
         self.init_ui()
         self.load_data()
     
@@ -618,6 +1006,9 @@ class MainWindow(QMainWindow):
         self.completed_table.setColumnCount(4)
         self.completed_table.setHorizontalHeaderLabels(['课程名', '学分', '分数', '操作'])
         self.completed_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.completed_table.setItemDelegateForColumn(
+            3, DeleteButtonDelegate(self.delete_completed_course, self.completed_table)
+        )
         layout.addWidget(self.completed_table)
         
         # 统计信息
@@ -688,6 +1079,9 @@ class MainWindow(QMainWindow):
             '课程名', '学分', '最低分', '最高分', '难度', '操作'
         ])
         self.planned_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.planned_table.setItemDelegateForColumn(
+            5, DeleteButtonDelegate(self.delete_planned_course, self.planned_table)
+        )
         layout.addWidget(self.planned_table)
         
         widget.setLayout(layout)
@@ -709,10 +1103,10 @@ class MainWindow(QMainWindow):
         self.target_score_input.setDecimals(2)
         target_layout.addWidget(self.target_score_input)
         
-        calc_btn = QPushButton("🚀 开始智能优化")
-        calc_btn.clicked.connect(self.run_optimization)
-        calc_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 8px;")
-        target_layout.addWidget(calc_btn)
+        self.optimize_btn = QPushButton("🚀 开始智能优化")
+        self.optimize_btn.clicked.connect(self.run_optimization)
+        self.optimize_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 8px;")
+        target_layout.addWidget(self.optimize_btn)
         
         target_layout.addStretch()
         target_group.setLayout(target_layout)
@@ -731,18 +1125,19 @@ class MainWindow(QMainWindow):
         result_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         layout.addWidget(result_label)
         
-        self.optimization_table = QTableWidget()
-        self.optimization_table.setColumnCount(6)
-        self.optimization_table.setHorizontalHeaderLabels([
-            '课程名', '学分', '分数范围', '难度', '优化目标', '说明'
-        ])
+        self.optimization_model = OptimizationTableModel(self)
+        self.optimization_table = QTableView()
+        self.optimization_table.setModel(self.optimization_model)
         self.optimization_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.optimization_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.optimization_table)
         
         # 建议和调整
-        self.suggestions_text = QTextEdit()
+        # 建议内容为纯文本，使用 QPlainTextEdit 跳过富文本排版
+        self.suggestions_text = QPlainTextEdit()
         self.suggestions_text.setReadOnly(True)
+        self.suggestions_text.setUndoRedoEnabled(False)
+        self.suggestions_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         self.suggestions_text.setMaximumHeight(200)
         layout.addWidget(self.suggestions_text)
         
@@ -764,8 +1159,7 @@ class MainWindow(QMainWindow):
             return
         
         course = CompletedCourse(name, credit, score)
-        self.data_manager.completed_courses.append(course)
-        self.data_manager.save_to_settings()
+        self.data_manager.add_completed_course(course)
         
         self.completed_name.clear()
         self.completed_credit.setValue(0)
@@ -794,8 +1188,7 @@ class MainWindow(QMainWindow):
             return
         
         course = PlannedCourse(name, credit, min_score, max_score, difficulty)
-        self.data_manager.planned_courses.append(course)
-        self.data_manager.save_to_settings()
+        self.data_manager.add_planned_course(course)
         
         self.planned_name.clear()
         self.planned_credit.setValue(0)
@@ -807,35 +1200,39 @@ class MainWindow(QMainWindow):
     
     def delete_completed_course(self, course_id: str):
         """删除已修课程"""
-        self.data_manager.completed_courses = [
-            c for c in self.data_manager.completed_courses if c.id != course_id
-        ]
-        self.data_manager.save_to_settings()
+        self.data_manager.delete_completed_course(course_id)
         self.refresh_completed_table()
     
     def delete_planned_course(self, course_id: str):
         """删除计划课程"""
-        self.data_manager.planned_courses = [
-            c for c in self.data_manager.planned_courses if c.id != course_id
-        ]
-        self.data_manager.save_to_settings()
+        self.data_manager.delete_planned_course(course_id)
         self.refresh_planned_table()
     
+    @staticmethod
+    def _make_action_item(course_id: str) -> QTableWidgetItem:
+        """操作列的单元格，课程ID存放在 UserRole 中供删除按钮委托读取"""
+        item = QTableWidgetItem()
+        item.setData(Qt.ItemDataRole.UserRole, course_id)
+        item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+        return item
+    
     def refresh_completed_table(self):
         """刷新已修课程表格"""
-        self.completed_table.setRowCount(len(self.data_manager.completed_courses))
-        
-        for i, course in enumerate(self.data_manager.completed_courses):
-            self.completed_table.setItem(i, 0, QTableWidgetItem(course.name))
-            self.completed_table.setItem(i, 1, QTableWidgetItem(str(course.credit)))
-            self.completed_table.setItem(i, 2, QTableWidgetItem(str(course.score)))
+        self._completed_shown_version = self.data_manager.completed_version
+        with _batch_table_update(self.completed_table):
+            self.completed_table.setRowCount(len(self.data_manager.completed_courses))
             
-            delete_btn = QPushButton("删除")
-            delete_btn.clicked.connect(lambda checked, cid=course.id: self.delete_completed_course(cid))
-            self.completed_table.setCellWidget(i, 3, delete_btn)
+            set_item = self.completed_table.setItem
+            make_item = QTableWidgetItem
+            make_action = self._make_action_item
+            for i, course in enumerate(self.data_manager.completed_courses):
+                set_item(i, 0, make_item(course.name))
+                set_item(i, 1, make_item(str(course.credit)))
+                set_item(i, 2, make_item(str(course.score)))
+                set_item(i, 3, make_action(course.id))
         
         # 更新统计
-        total_credit, avg = OptimizationEngine.calculate_weighted_avg(self.data_manager.completed_courses)
+        total_credit, avg = self.data_manager.completed_weighted_avg()
         if total_credit == 0:
             self.completed_summary.setText("目前还没有已修课程记录。")
         else:
@@ -845,18 +1242,25 @@ class MainWindow(QMainWindow):
     
     def refresh_planned_table(self):
         """刷新计划课程表格"""
-        self.planned_table.setRowCount(len(self.data_manager.planned_courses))
-        
-        for i, course in enumerate(self.data_manager.planned_courses):
-            self.planned_table.setItem(i, 0, QTableWidgetItem(course.name))
-            self.planned_table.setItem(i, 1, QTableWidgetItem(str(course.credit)))
-            self.planned_table.setItem(i, 2, QTableWidgetItem(str(course.min_score)))
-            self.planned_table.setItem(i, 3, QTableWidgetItem(str(course.max_score)))
-            self.planned_table.setItem(i, 4, QTableWidgetItem(f"{course.difficulty:.1f}"))
+        self._planned_shown_version = self.data_manager.planned_version
+        with _batch_table_update(self.planned_table):
+            self.planned_table.setRowCount(len(self.data_manager.planned_courses))
             
-            delete_btn = QPushButton("删除")
-            delete_btn.clicked.connect(lambda checked, cid=course.id: self.delete_planned_course(cid))
-            self.planned_table.setCellWidget(i, 5, delete_btn)
+            set_item = self.planned_table.setItem
+            make_item = QTableWidgetItem
+            make_action = self._make_action_item
+            for i, course in enumerate(self.data_manager.planned_courses):
+                set_item(i, 0, make_item(course.name))
+                set_item(i, 1, make_item(str(course.credit)))
+                set_item(i, 2, make_item(str(course.min_score)))
+                set_item(i, 3, make_item(str(course.max_score)))
+                set_item(i, 4, make_item(f"{course.difficulty:.1f}"))
+                set_item(i, 5, make_action(course.id))
+    
+    def _optimization_key(self) -> Tuple:
+        """当前课程数据和目标分数对应的优化输入标识"""
+        dm = self.data_manager
+        return (dm.planned_version, dm.completed_version, dm.target_score)
     
     def run_optimization(self):
         """运行优化算法"""
@@ -870,98 +1274,108 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先添加计划课程")
             return
         
-        self.data_manager.target_score = target
-        self.data_manager.save_to_settings()
+        if target != self.data_manager.target_score:
+            self.data_manager.target_score = target
+            self.data_manager.schedule_save()
+        
+        self._optimizing_key = self._optimization_key()
+        
+        # 数据和目标都未变化时直接显示上次的结果
+        last_key, last_result = self._last_optimization
+        if last_key == self._optimizing_key:
+            self._on_optimization_done(last_result)
+            return
         
-        # 运行优化
-        result = OptimizationEngine.optimize_scores(
+        # 在后台线程运行优化
+        self.optimize_btn.setEnabled(False)
+        task = OptimizeTask(
             self.data_manager.completed_courses,
             self.data_manager.planned_courses,
-            target
+            target,
+            self.data_manager.get_planned_arrays()
         )
-        
-        # 更新优化目标到课程
-        if result['feasible'] and result['optimized_scores']:
-            for i, course in enumerate(self.data_manager.planned_courses):
-                course.optimized_target = result['optimized_scores'][i]
-            self.data_manager.save_to_settings()
+        task.signals.finished.connect(self._on_optimization_done)
+        task.signals.failed.connect(self._on_optimization_failed)
+        self._optimize_task = task
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_optimization_done(self, result: Dict):
+        """优化完成（主线程）"""
+        self.optimize_btn.setEnabled(True)
+        self._optimize_task = None
+        
+        # 优化期间课程或目标已被修改，结果不再对应当前数据，按新数据重新优化
+        if self._optimizing_key != self._optimization_key():
+            self.run_optimization()
+            return
+        self._last_optimization = (self._optimizing_key, result)
+        
+        # 更新优化目标到课程，与上次结果相同时无需保存
+        scores = result['optimized_scores']
+        planned = self.data_manager.planned_courses
+        if result['feasible'] and scores and any(
+            c.optimized_target is None or abs(c.optimized_target - score) > 1e-6
+            for c, score in zip(planned, scores)
+        ):
+            for course, score in zip(planned, scores):
+                course.optimized_target = score
+            self.data_manager.schedule_save()
         
         # 显示结果
         self.display_optimization_result(result)
     
+    def _on_optimization_failed(self, message: str):
+        """优化失败（主线程）"""
+        self.optimize_btn.setEnabled(True)
+        self._optimize_task = None
+        QMessageBox.critical(self, "错误", f"优化失败：{message}")
+    
     def display_optimization_result(self, result: Dict):
         """显示优化结果"""
         # 摘要
-        if result['feasible']:
-            color = "green"
-            status = "✅ 目标可达成"
-        else:
-            color = "red"
-            status = "❌ 目标无法达成"
-        
-        summary_html = f"""
-        <div style='font-size: 14px;'>
-            <p style='color: {color}; font-weight: bold; font-size: 16px;'>{status}</p>
-            <p><b>目标GPA:</b> {self.data_manager.target_score:.2f}</p>
-            <p><b>预期GPA:</b> {result['total_gpa']:.2f}</p>
-        </div>
-        """
-        self.optimization_summary.setText(summary_html)
+        color, status = self.SUMMARY_STATUS[bool(result['feasible'])]
+        self.optimization_summary.setText(self.SUMMARY_TEMPLATE.format(
+            color=color, status=status,
+            target=self.data_manager.target_score, gpa=result['total_gpa']
+        ))
+        
+        # 表格：先整体计算难度档位和目标档位（0=需要高分，1=要求低，2=中等）
+        planned = self.data_manager.planned_courses
+        arrays = self.data_manager.get_planned_arrays()
+        targets = np.asarray(result['optimized_scores'], dtype=np.float64)
+        scored = len(targets)
+        diff_idx = np.digitize(arrays['difficulties'], OptimizationEngine.DIFFICULTY_BINS)
+        score_idx = np.where(
+            targets >= arrays['max_scores'][:scored] * 0.9, 0,
+            np.where(targets <= arrays['min_scores'][:scored] * 1.1, 1, 2)
+        )
         
-        # 表格
-        self.optimization_table.setRowCount(len(self.data_manager.planned_courses))
-        
-        for i, course in enumerate(self.data_manager.planned_courses):
-            self.optimization_table.setItem(i, 0, QTableWidgetItem(course.name))
-            self.optimization_table.setItem(i, 1, QTableWidgetItem(str(course.credit)))
-            self.optimization_table.setItem(i, 2, QTableWidgetItem(
-                f"{course.min_score:.0f} - {course.max_score:.0f}"
-            ))
-            
-            # 难度显示
-            if course.difficulty < 0.3:
-                diff_text = "简单 📗"
-            elif course.difficulty < 0.7:
-                diff_text = "中等 📘"
-            else:
-                diff_text = "困难 📕"
-            self.optimization_table.setItem(i, 3, QTableWidgetItem(diff_text))
-            
-            # 优化目标
-            if result['optimized_scores'] and i < len(result['optimized_scores']):
-                target_score = result['optimized_scores'][i]
-                target_item = QTableWidgetItem(f"{target_score:.1f}")
-                
-                # 根据难度和目标分数设置颜色
-                if target_score >= course.max_score * 0.9:
-                    target_item.setBackground(QColor(255, 200, 200))  # 红色 - 需要高分
-                elif target_score <= course.min_score * 1.1:
-                    target_item.setBackground(QColor(200, 255, 200))  # 绿色 - 要求低
-                else:
-                    target_item.setBackground(QColor(255, 255, 200))  # 黄色 - 中等
-                
-                self.optimization_table.setItem(i, 4, target_item)
-                
-                # 说明
-                if target_score >= course.max_score * 0.9:
-                    note = "需要全力以赴"
-                elif target_score <= course.min_score * 1.1:
-                    note = "保持正常水平即可"
-                else:
-                    note = "需要认真准备"
-                self.optimization_table.setItem(i, 5, QTableWidgetItem(note))
+        unscored = [None] * (len(planned) - scored)
+        self.optimization_model.set_rows(
+            [
+                [c.name for c in planned],
+                [str(c.credit) for c in planned],
+                [f"{c.min_score:.0f} - {c.max_score:.0f}" for c in planned],
+                [self.DIFFICULTY_TEXTS[k] for k in diff_idx],
+                [f"{t:.1f}" for t in targets] + unscored,
+                [self.TARGET_NOTES[k] for k in score_idx] + unscored
+            ],
+            [self.TARGET_COLORS[k] for k in score_idx] + unscored
+        )
         
         # 建议
-        suggestions_text = "\n".join(result['suggestions'])
+        parts = ["\n".join(result['suggestions'])]
         
         if not result['feasible'] and result.get('adjustments'):
-            suggestions_text += "\n\n" + "="*50 + "\n"
-            suggestions_text += "💡 调整建议：\n\n"
-            for i, option in enumerate(result['adjustments']['options'], 1):
-                suggestions_text += f"{i}. {option['description']}\n"
-                suggestions_text += f"   可行性: {option['feasibility']}\n\n"
+            parts.append("\n\n" + "="*50 + "\n💡 调整建议：\n\n")
+            parts.extend(
+                f"{i}. {option['description']}\n   可行性: {option['feasibility']}\n\n"
+                for i, option in enumerate(result['adjustments']['options'], 1)
+            )
         
-        self.suggestions_text.setPlainText(suggestions_text)
+        self.suggestions_text.setUpdatesEnabled(False)
+        self.suggestions_text.setPlainText("".join(parts))
+        self.suggestions_text.setUpdatesEnabled(True)
     
     def export_json(self):
         """导出JSON"""
@@ -977,6 +1391,10 @@ class MainWindow(QMainWindow):
     
     def import_json(self):
         """导入JSON"""
+        # 上一次导入尚未完成时不再开始新的导入，避免两次结果先后被应用
+        if self._import_task is not None:
+            return
+        
         filepath, _ = QFileDialog.getOpenFileName(
             self, "导入JSON", "", "JSON Files (*.json)"
         )
@@ -992,27 +1410,63 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.Cancel:
                 return
             
-            merge = (reply == QMessageBox.StandardButton.Yes)
+            self._import_merge = (reply == QMessageBox.StandardButton.Yes)
             
-            try:
-                self.data_manager.import_from_json(filepath, merge)
-                self.load_data()
-                QMessageBox.information(self, "成功", "数据已成功导入！")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"导入失败：{str(e)}\n\n请确保JSON格式正确。")
+            # 在后台线程读取和解析文件，较大的文件不会卡住界面
+            self._import_progress = QProgressDialog("正在导入数据...", None, 0, 0, self)
+            self._import_progress.setWindowTitle("导入JSON")
+            self._import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+            self._import_progress.setMinimumDuration(300)
+            self._import_progress.setValue(0)
+            
+            task = ImportTask(filepath)
+            task.signals.finished.connect(self._on_import_loaded)
+            task.signals.failed.connect(self._on_import_failed)
+            self._import_task = task
+            QThreadPool.globalInstance().start(task)
+    
+    def _finish_import(self):
+        self._import_task = None
+        if self._import_progress is not None:
+            self._import_progress.close()
+            self._import_progress = None
+    
+    def _on_import_loaded(self, data: Dict):
+        """导入文件解析完成（主线程）"""
+        self._finish_import()
+        try:
+            self.data_manager.apply_imported(data, self._import_merge)
+            self.load_data()
+            QMessageBox.information(self, "成功", "数据已成功导入！")
+        except Exception as e:
+            self._on_import_failed(str(e))
+    
+    def _on_import_failed(self, message: str):
+        """导入失败（主线程）"""
+        self._finish_import()
+        QMessageBox.critical(self, "错误", f"导入失败：{message}\n\n请确保JSON格式正确。")
     
     def show_llm_guide(self):
         """显示LLM使用指南"""
         dialog = LLMGuideDialog(self)
         dialog.exec()
     
+    def closeEvent(self, event):
+        """关闭窗口前写入尚未保存的修改"""
+        self.data_manager.flush_save()
+        super().closeEvent(event)
+    
     def load_data(self):
         """加载数据到界面"""
-        self.refresh_completed_table()
-        self.refresh_planned_table()
+        if self._completed_shown_version != self.data_manager.completed_version:
+            self.refresh_completed_table()
+        if self._planned_shown_version != self.data_manager.planned_version:
+            self.refresh_planned_table()
         
         if self.data_manager.target_score:
-            self.target_score_input.setValue(self.data_manager.target_score)
+            # 回填已保存的目标分数时不触发 valueChanged
+            with QSignalBlocker(self.target_score_input):
+                self.target_score_input.setValue(self.data_manager.target_score)
 
 
 def main():